@@ -1,12 +1,83 @@
+"""
+Board hook for M5Stack Tab5 (ESP32-P4)
+
+Installs the M5Stack libraries required by the board into the project
+libdeps folder when the Arduino framework is used.
+"""
+
+import json
+import os
+from pathlib import Path
+
+MANIFEST_NAME = ".m5deps.json"
+
+
+def _lib_name(lib):
+    return lib.split("/")[-1].replace(".git", "")
+
+
+def _scan_installed(lib_dir):
+    """Map library directory names in lib_dir to their scandir entries"""
+    try:
+        with os.scandir(lib_dir) as it:
+            return {entry.name: entry for entry in it if entry.is_dir()}
+    except OSError:
+        return {}
+
+
+def _is_installed(installed, lib):
+    """A library counts as installed only with the Library Manager's .piopm"""
+    entry = installed.get(_lib_name(lib))
+    return entry is not None and os.path.exists(os.path.join(entry.path, ".piopm"))
+
+
+def _deps_satisfied(lib_dir, deps, installed):
+    """Check the resolved-deps manifest written by a previous install"""
+    try:
+        with open(lib_dir / MANIFEST_NAME, "r", encoding="utf8") as fp:
+            resolved = json.load(fp)
+    except (OSError, ValueError):
+        return False
+    return all(lib in resolved and _is_installed(installed, lib) for lib in deps)
+
+
+def _write_manifest(lib_dir, resolved):
+    manifest_path = lib_dir / MANIFEST_NAME
+    tmp_path = lib_dir / (MANIFEST_NAME + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf8") as fp:
+            json.dump(resolved, fp, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        print(f"Warning: Could not write {manifest_path}: {e}")
+
+
 def configure_board(env):
     if "arduino" in env.get("PIOFRAMEWORK", []):
         deps = ["https://github.com/M5Stack/M5Unified.git"]
+        lib_dir = Path(env.subst("$PROJECT_DIR")) / ".pio" / "libdeps" / env.subst("$PIOENV")
+
+        # Warm run: everything was resolved before, no need for the Library Manager
+        installed = _scan_installed(lib_dir)
+        if _deps_satisfied(lib_dir, deps, installed):
+            return
+
         # Install libraries using PlatformIO Library Manager
-        from pathlib import Path
         from platformio.package.manager.library import LibraryPackageManager
 
-        lib_dir = Path(env.subst("$PROJECT_DIR")) / ".pio" / "libdeps" / env.subst("$PIOENV")
         lm = LibraryPackageManager(package_dir=lib_dir)
 
+        # Skip libraries already installed, install the remaining ones. A folder
+        # without .piopm is half-installed or copied by hand and gets repaired.
+        resolved = {}
         for lib in deps:
-            lm.install(lib)
+            if _is_installed(installed, lib):
+                resolved[lib] = None
+                continue
+            pkg = lm.install(lib)
+            metadata = getattr(pkg, "metadata", None)
+            resolved[lib] = (
+                str(metadata.version) if metadata and metadata.version else None
+            )
+
+        _write_manifest(lib_dir, resolved)
@@ -21,6 +21,12 @@ from SCons.Script import Builder
 
 Import("env")
 
+# Both arduino.py and espidf.py load this script and both run in one build
+# for Hybrid Compile and Arduino as an IDF component. Configure only once.
+if env.get("EMBED_FILES_CONFIGURED"):
+    Return()
+env["EMBED_FILES_CONFIGURED"] = True
+
 board = env.BoardConfig()
 mcu = board.get("build.mcu", "esp32")
 is_xtensa = mcu in ("esp32", "esp32s2", "esp32s3")
@@ -25,10 +25,13 @@ http://arduino.cc/en/Reference/HomePage
 import hashlib
 import os
 import shutil
+import stat
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
-from os.path import join, exists, isabs, splitdrive, commonpath, relpath
+from functools import lru_cache
+from os.path import join, exists, isabs
 from pathlib import Path
 from typing import Union, List
 
@@ -40,10 +43,10 @@ from platformio.compat import IS_WINDOWS
 from component_manager import board_memory_fingerprint
 
 # Constants for better performance
-UNICORE_FLAGS = {
+UNICORE_FLAGS = frozenset({
     "CORE32SOLO1",
     "CONFIG_FREERTOS_UNICORE=y"
-}
+})
 
 # Thread-safe lock for one-time warning message
 _WARN_LOCK = threading.Lock()
@@ -52,6 +55,9 @@ _LONG_PATH_WARNING_SHOWN = False
 
 # Cache class for frequently used paths
 class PathCache:
+    __slots__ = ("platform", "mcu", "chip_variant",
+                 "_framework_dir", "_framework_lib_dir", "_sdk_dir")
+
     def __init__(self, platform, mcu, chip_variant):
         self.platform = platform
         self.mcu = mcu
@@ -80,7 +86,7 @@ class PathCache:
             if not self.framework_lib_dir:
                 return None
             self._sdk_dir = fs.to_unix_path(
-                str(Path(self.framework_lib_dir) / self.chip_variant / "include")
+                join(self.framework_lib_dir, self.chip_variant, "include")
             )
         return self._sdk_dir
 
@@ -146,18 +152,23 @@ def safe_delete_file(file_path: Union[str, Path],
         return False
 
 
+def _clear_readonly_and_retry(func, path, _exc):
+    """rmtree error handler, read-only files would make the removal fail on Windows"""
+    with suppress(OSError):
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+
+
 def safe_delete_directory(dir_path: Union[str, Path]) -> bool:
     """
-    Secure directory deletion
+    Secure directory deletion, a missing directory counts as deleted
     """
-    dir_path = Path(dir_path)
-    try:
-        if not dir_path.exists():
-            return False
-        shutil.rmtree(dir_path)
-        return True
-    except Exception:
-        return False
+    with suppress(OSError):
+        if sys.version_info >= (3, 12):
+            shutil.rmtree(dir_path, onexc=_clear_readonly_and_retry)
+        else:
+            shutil.rmtree(dir_path, onerror=_clear_readonly_and_retry)
+    return not exists(dir_path)
 
 
 def validate_platformio_path(path: Union[str, Path]) -> bool:
@@ -221,28 +232,40 @@ def validate_deletion_path(path: Union[str, Path],
 
 def safe_framework_cleanup():
     """Secure cleanup of Arduino Framework with enhanced error handling"""
+    targets = [
+        (dir_path, label)
+        for dir_path, label in ((FRAMEWORK_DIR, "framework"),
+                                (FRAMEWORK_LIB_DIR, "framework libs"))
+        if dir_path and validate_platformio_path(dir_path)
+    ]
+    if not targets:
+        return True
+
+    # Both trees hold many small files, remove them concurrently
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        results = list(executor.map(
+            safe_delete_directory, [dir_path for dir_path, _ in targets]))
+
     success = True
-    if exists(FRAMEWORK_DIR):
-        if validate_platformio_path(FRAMEWORK_DIR):
-            if not safe_delete_directory(FRAMEWORK_DIR):
-                print("Error removing framework")
-                success = False
-    if exists(FRAMEWORK_LIB_DIR):
-        if validate_platformio_path(FRAMEWORK_LIB_DIR):
-            if not safe_delete_directory(FRAMEWORK_LIB_DIR):
-                print("Error removing framework libs")
-                success = False
+    for (_, label), removed in zip(targets, results):
+        if not removed:
+            print(f"Error removing {label}")
+            success = False
     return success
 
 
 def safe_remove_sdkconfig_files():
     """Secure removal of SDKConfig files"""
-    envs = [section.replace("env:", "") for section in config.sections()
-            if section.startswith("env:")]
-    for env_name in envs:
-        file_path = str(Path(project_dir) / f"sdkconfig.{env_name}")
-        if exists(file_path):
-            safe_delete_file(file_path)
+    envs = {section[4:] for section in config.sections()
+            if section.startswith("env:")}
+    # One directory read instead of a stat per configured environment
+    prefix = "sdkconfig."
+    with suppress(OSError), os.scandir(project_dir) as entries:
+        for entry in entries:
+            if (entry.name.startswith(prefix)
+                    and entry.name[len(prefix):] in envs
+                    and entry.is_file()):
+                safe_delete_file(entry.path)
 
 
 # Initialization
@@ -254,10 +277,12 @@ board = env.BoardConfig()
 
 # Cached values
 mcu = board.get("build.mcu", "esp32")
-chip_variant = env.BoardConfig().get("build.chip_variant", "").lower()
+chip_variant = board.get("build.chip_variant", "").lower()
 chip_variant = chip_variant if chip_variant else mcu
 pioenv = env["PIOENV"]
 project_dir = env.subst("$PROJECT_DIR")
+# Framework names of this build, read as a list without substitution
+pioframework = env.get("PIOFRAMEWORK", [])
 path_cache = PathCache(platform, mcu, chip_variant)
 current_env_section = f"env:{pioenv}"
 
@@ -265,19 +290,8 @@ current_env_section = f"env:{pioenv}"
 board_sdkconfig = board.get("espidf.custom_sdkconfig", "")
 entry_custom_sdkconfig = "\n"
 flag_custom_sdkconfig = False
-flag_custom_component_remove = False
-flag_custom_component_add = False
-flag_lib_ignore = False
 flag_lto = False
 
-# pio lib_ignore check
-if config.has_option(current_env_section, "lib_ignore"):
-    flag_lib_ignore = True
-
-# Custom Component remove check
-if config.has_option(current_env_section, "custom_component_remove"):
-    flag_custom_component_remove = True
-
 # Custom SDKConfig check
 if config.has_option(current_env_section, "custom_sdkconfig"):
     entry_custom_sdkconfig = env.GetProjectOption("custom_sdkconfig")
@@ -300,85 +314,98 @@ if config.has_option(current_env_section, "custom_sdkconfig"):
 if board_sdkconfig:
     flag_custom_sdkconfig = True
 
+# Pre-tokenize board extra_flags once into a set of macro definitions
 extra_flags_raw = board.get("build.extra_flags", [])
-if isinstance(extra_flags_raw, list):
-    extra_flags = " ".join(extra_flags_raw).replace("-D", " ")
-else:
-    extra_flags = str(extra_flags_raw).replace("-D", " ")
+if not isinstance(extra_flags_raw, list):
+    extra_flags_raw = [str(extra_flags_raw)]
+extra_flag_defs = {
+    token.removeprefix("-D")
+    for item in extra_flags_raw
+    for token in item.split()
+}
 
-framework_reinstall = False
 
-FRAMEWORK_DIR = path_cache.framework_dir
-FRAMEWORK_LIB_DIR = path_cache.framework_lib_dir
+def config_tokens(value):
+    """Split a sdkconfig string or list of lines into whitespace tokens"""
+    items = value if isinstance(value, list) else [value]
+    return frozenset(token for item in items for token in str(item).split())
 
-SConscript("_embed_files.py", exports="env")
 
-flag_any_custom_sdkconfig = (FRAMEWORK_LIB_DIR is not None and
-                            exists(str(Path(FRAMEWORK_LIB_DIR) / "sdkconfig")))
+# All flag and sdkconfig tokens, for whole-token membership tests
+config_flag_tokens = (frozenset(extra_flag_defs)
+                      | config_tokens(entry_custom_sdkconfig)
+                      | config_tokens(board_sdkconfig))
+
+FRAMEWORK_DIR = path_cache.framework_dir
+FRAMEWORK_LIB_DIR = path_cache.framework_lib_dir
 
 
-def has_unicore_flags():
-    """Check if any UNICORE flags are present in configuration"""
-    return any(flag in extra_flags or flag in entry_custom_sdkconfig
-               or flag in board_sdkconfig for flag in UNICORE_FLAGS)
+@lru_cache(maxsize=1)
+def any_custom_sdkconfig():
+    """Checks once if the installed framework libs were built from a custom sdkconfig"""
+    return (FRAMEWORK_LIB_DIR is not None and
+            exists(join(FRAMEWORK_LIB_DIR, "sdkconfig")))
 
 
-def has_psram_config():
-    """Check if PSRAM is configured in extra_flags, entry_custom_sdkconfig or board_sdkconfig"""
-    return ("PSRAM" in extra_flags or "PSRAM" in entry_custom_sdkconfig
-            or "PSRAM" in board_sdkconfig or "CONFIG_SPIRAM=y" in extra_flags
-            or "CONFIG_SPIRAM=y" in entry_custom_sdkconfig
-            or "CONFIG_SPIRAM=y" in board_sdkconfig)
+# Configuration checks, evaluated once since the configuration is fixed
+# UNICORE flags present in configuration
+has_unicore = not UNICORE_FLAGS.isdisjoint(config_flag_tokens)
 
+# PSRAM configured in extra_flags, entry_custom_sdkconfig or board_sdkconfig
+has_psram = (any("PSRAM" in flag for flag in extra_flag_defs)
+             or "PSRAM" in entry_custom_sdkconfig
+             or "PSRAM" in board_sdkconfig or "CONFIG_SPIRAM=y" in extra_flag_defs
+             or "CONFIG_SPIRAM=y" in entry_custom_sdkconfig
+             or "CONFIG_SPIRAM=y" in board_sdkconfig)
 
-def has_picolibc_config():
-    """Check if picolibc is configured in custom_sdkconfig"""
-    return ("CONFIG_LIBC_PICOLIBC=y" in entry_custom_sdkconfig or
-            "CONFIG_LIBC_PICOLIBC=y" in board_sdkconfig)
+# picolibc configured in custom_sdkconfig
+has_picolibc = ("CONFIG_LIBC_PICOLIBC=y" in entry_custom_sdkconfig or
+                "CONFIG_LIBC_PICOLIBC=y" in board_sdkconfig)
 
 
 # Esp32 settings for solo1 and PSRAM
 if flag_custom_sdkconfig:
-    if not env.get('BUILD_UNFLAGS'):  # Initialize if not set
-        env['BUILD_UNFLAGS'] = []
-
-    build_unflags = " ".join(env['BUILD_UNFLAGS'])
+    current_unflags = env.get('BUILD_UNFLAGS') or []
+    if isinstance(current_unflags, str):
+        current_unflags = [current_unflags]
+    build_unflags = [flag for item in current_unflags for flag in item.split()]
 
     # -Wl,--wrap=log_printf: remove always. Diagnostics is not supported with HybridCompile
-    build_unflags += " -Wl,--wrap=log_printf"
+    build_unflags.append("-Wl,--wrap=log_printf")
 
     # -mdisable-hardware-atomics: always for solo1, or when PSRAM is NOT configured
-    if has_unicore_flags() or not has_psram_config():
-        build_unflags += " -mdisable-hardware-atomics"
+    if has_unicore or not has_psram:
+        build_unflags.append("-mdisable-hardware-atomics")
 
     # -ustart_app_other_cores only and always for solo1
-    if has_unicore_flags():
-        build_unflags += " -ustart_app_other_cores"
+    if has_unicore:
+        build_unflags.append("-ustart_app_other_cores")
 
     # Check for enabling LTO for Arduino HybridCompile part by unflagging -fno-lto
     if '-fno-lto' in build_unflags:
         flag_lto = True
 
-    new_build_unflags = build_unflags.split()
-    env.Replace(BUILD_UNFLAGS=new_build_unflags)
+    env.Replace(BUILD_UNFLAGS=build_unflags)
 
     # add linker script esp32.rom.libc-funcs.ld for esp32 when PSRAM is NOT configured
-    if mcu == "esp32" and not has_psram_config():
+    if mcu == "esp32" and not has_psram:
         env.Append(LINKFLAGS=["-T", "esp32.rom.libc-funcs.ld"])
 
 
-def get_MD5_hash(phrase):
-    return hashlib.md5(phrase.encode('utf-8')).hexdigest()[:16]
+def get_sdkconfig_checksum(phrase):
+    # Must match get_sdkconfig_checksum() in espidf.py which writes the checksum
+    return hashlib.blake2b(phrase.encode('utf-8'), digest_size=8).hexdigest()
 
 
+@lru_cache(maxsize=1)
 def matching_custom_sdkconfig():
     """Checks if current environment matches existing sdkconfig"""
     cust_sdk_is_present = False
 
-    if not flag_any_custom_sdkconfig:
+    if not any_custom_sdkconfig():
         return True, cust_sdk_is_present
 
-    last_sdkconfig_path = str(Path(project_dir) / "sdkconfig.defaults")
+    last_sdkconfig_path = join(project_dir, "sdkconfig.defaults")
     if not exists(last_sdkconfig_path):
         return False, cust_sdk_is_present
 
@@ -386,13 +413,14 @@ def matching_custom_sdkconfig():
         return False, cust_sdk_is_present
 
     try:
-        with open(last_sdkconfig_path) as src:
-            line = src.readline()
+        # Unbuffered read of the header only, "# TASMOTA__<hash>" fits in 64 bytes
+        with open(last_sdkconfig_path, "rb", buffering=0) as src:
+            line = src.read(64).split(b"\n", 1)[0].decode("utf-8", "replace")
             if line.startswith("# TASMOTA__"):
                 cust_sdk_is_present = True
-                custom_options = entry_custom_sdkconfig
-                expected_hash = get_MD5_hash(custom_options.strip() + mcu
-                                             + board_memory_fingerprint(env, board))
+                expected_hash = get_sdkconfig_checksum(
+                    entry_custom_sdkconfig.strip() + mcu
+                    + board_memory_fingerprint(env, board))
                 if line.split("__")[1].strip() == expected_hash:
                     return True, cust_sdk_is_present
     except (IOError, IndexError):
@@ -402,7 +430,7 @@ def matching_custom_sdkconfig():
 
 
 def check_reinstall_frwrk():
-    if not flag_custom_sdkconfig and flag_any_custom_sdkconfig:
+    if not flag_custom_sdkconfig and any_custom_sdkconfig():
         # case custom sdkconfig exists and an env without "custom_sdkconfig"
         return True
 
@@ -415,55 +443,54 @@ def check_reinstall_frwrk():
     return False
 
 
+@lru_cache(maxsize=None)
+def get_package_uri(package_name):
+    """Extracts the download URI from the platform package spec, None if absent"""
+    spec = str(platform.get_package_spec(package_name))
+    if "uri=" not in spec:
+        return None
+    return spec.split("uri=", 1)[1][:-1]
+
+
 def call_compile_libs():
     print(f"*** Compile Arduino IDF libs for {pioenv} ***")
     SConscript("espidf.py")
 
 
-FRAMEWORK_SDK_DIR = path_cache.sdk_dir
 IS_INTEGRATION_DUMP = env.IsIntegrationDump()
 
 
-def is_framework_subfolder(potential_subfolder):
-    """Check if a path is a subfolder of the framework SDK directory"""
-    # carefully check before change this function
-    if FRAMEWORK_SDK_DIR is None:
-        return False
-    if not isabs(potential_subfolder):
-        return False
-    if (splitdrive(FRAMEWORK_SDK_DIR)[0] !=
-            splitdrive(potential_subfolder)[0]):
-        return False
-    return (commonpath([FRAMEWORK_SDK_DIR]) ==
-            commonpath([FRAMEWORK_SDK_DIR, potential_subfolder]))
-
-
-def get_frameworks_in_current_env():
-    """Determines the frameworks of the current environment"""
-    if "framework" in config.options(current_env_section):
-        return config.get(current_env_section, "framework", "")
-    return []
-
-
-# Framework check
-current_env_frameworks = get_frameworks_in_current_env()
+# Framework check, the frameworks of the current environment as a set
+current_env_frameworks = frozenset()
+if config.has_option(current_env_section, "framework"):
+    env_frameworks = config.get(current_env_section, "framework", [])
+    if isinstance(env_frameworks, str):
+        env_frameworks = env_frameworks.split(",")
+    current_env_frameworks = frozenset(
+        item.strip() for item in env_frameworks if item.strip())
 if "arduino" in current_env_frameworks and "espidf" in current_env_frameworks:
     # Arduino as component is set, switch off Hybrid compile
     flag_custom_sdkconfig = False
 
-# Framework reinstallation if required
-if check_reinstall_frwrk():
+# Framework reinstallation if required (never for IDE integration dumps)
+if not IS_INTEGRATION_DUMP and check_reinstall_frwrk():
+    # Resolve the download URIs before anything is deleted
+    arduino_frmwrk_urls = [
+        get_package_uri("framework-arduinoespressif32"),
+        get_package_uri("framework-arduinoespressif32-libs"),
+    ]
+    if None in arduino_frmwrk_urls:
+        print("Error: Arduino framework package spec without download URI "
+              "- installation aborted")
+        sys.exit(1)
+
     safe_remove_sdkconfig_files()
 
     print("*** Reinstall Arduino framework ***")
 
     if safe_framework_cleanup():
-        arduino_frmwrk_url = str(platform.get_package_spec(
-            "framework-arduinoespressif32")).split("uri=", 1)[1][:-1]
-        arduino_frmwrk_lib_url = str(platform.get_package_spec(
-            "framework-arduinoespressif32-libs")).split("uri=", 1)[1][:-1]
-        pm.install(arduino_frmwrk_url)
-        pm.install(arduino_frmwrk_lib_url)
+        for url in arduino_frmwrk_urls:
+            pm.install(url)
 
         if flag_custom_sdkconfig:
             call_compile_libs()
@@ -472,11 +499,15 @@ if check_reinstall_frwrk():
         print("Framework cleanup failed - installation aborted")
         sys.exit(1)
 
-if flag_custom_sdkconfig and not flag_any_custom_sdkconfig:
+if flag_custom_sdkconfig and not any_custom_sdkconfig():
     call_compile_libs()
 
+# With Arduino as an IDF component espidf.py sets up the embedded files
+if "espidf" not in pioframework:
+    SConscript("_embed_files.py", exports="env")
+
 # Arduino framework configuration and build logic
-pioframework = env.subst("$PIOFRAMEWORK")
+# (evaluated here since call_compile_libs() may have changed the flag)
 arduino_lib_compile_flag = env.subst("$ARDUINO_LIB_COMPILE_FLAG")
 
 # Setup Arduino relinker if configured (must run before build script).
@@ -495,7 +526,7 @@ if ("arduino" in pioframework and "espidf" not in pioframework and
     component_manager.handle_component_settings()
 
     # Create backup once if any build script patches are needed
-    needs_build_script_patch = flag_lto or has_picolibc_config()
+    needs_build_script_patch = flag_lto or has_picolibc
     if needs_build_script_patch:
         component_manager.backup_manager.backup_pioarduino_build_py()
 
@@ -506,7 +537,7 @@ if ("arduino" in pioframework and "espidf" not in pioframework and
         component_manager.add_lto_flags()
 
     # Handle picolibc flags if picolibc is configured
-    if has_picolibc_config():
+    if has_picolibc:
         component_manager.apply_picolibc_flags()
 
     silent_action = env.Action(component_manager.restore_pioarduino_build_py)
@@ -531,5 +562,5 @@ if ("arduino" in pioframework and "espidf" not in pioframework and
                 env[_var] = "${TEMPFILE('%s')}" % env[_var]
 
 
-    build_script_path = str(Path(FRAMEWORK_DIR) / "tools" / "pioarduino-build.py")
+    build_script_path = join(FRAMEWORK_DIR, "tools", "pioarduino-build.py")
     SConscript(build_script_path)
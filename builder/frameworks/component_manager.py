@@ -12,12 +12,169 @@ by the Arduino HybridCompile checksum.
 import os
 import shutil
 import re
+import stat
+import sys
 import yaml
-from pathlib import Path
-from typing import Set, Optional, Dict, Any, List, Tuple, Pattern
-from yaml import SafeLoader
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Set, Optional, Dict, Any, Iterable, List, Tuple, Pattern
 from platformio.exception import PlatformioException
 
+try:
+    # libyaml based C implementations, much faster when available
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# "name=" entry of a library.properties file, leading whitespace allowed
+_PROPERTIES_NAME_RE = re.compile(rb'(?m)^[ \t]*name=([^\r\n]*)')
+
+# Common lib_ignore name prefixes and suffixes. Each one is stripped at most
+# once and in this order: lib, arduino-, esp32-, esp- then -lib, -library, .h
+_LIB_PREFIX_RE = re.compile(r'^(?:lib)?(?:arduino-)?(?:esp32-)?(?:esp-)?')
+_LIB_SUFFIX_RE = re.compile(r'(?:\.h)?(?:-library)?(?:-lib)?$')
+
+# Library name normalization: drop spaces, dashes become underscores
+_LIB_NAME_TABLE = str.maketrans({' ': None, '-': '_'})
+
+# Arduino library name to ESP-IDF component include path, with Arduino Core Libraries
+_EXTENDED_MAPPING: Dict[str, str] = {
+    # Core ESP32 mappings
+    'wifi': 'esp_wifi',
+    'bluetooth': 'bt',
+    'bluetoothserial': 'bt',
+    'ble': 'bt',
+    'bt': 'bt',
+    'ethernet': 'esp_eth',
+    'websocket': 'esp_websocket_client',
+    'http': 'esp_http_client',
+    'https': 'esp_https_ota',
+    'ota': 'esp_https_ota',
+    'spiffs': 'spiffs',
+    'fatfs': 'fatfs',
+    'mesh': 'esp_wifi_mesh',
+    'smartconfig': 'esp_smartconfig',
+    'mdns': 'mdns',
+    'coap': 'coap',
+    'mqtt': 'mqtt',
+    'json': 'cjson',
+    'mbedtls': 'mbedtls',
+    'openssl': 'openssl',
+
+    # Arduino Core specific mappings (safe mappings that don't conflict with critical components)
+    'esp32blearduino': 'bt',
+    'esp32_ble_arduino': 'bt',
+    'simpleble': 'bt',
+    'esp_nimble_cpp': 'bt',
+    'nimble_arduino': 'bt',
+    'esp32': 'esp32',
+    'wire': 'driver',
+    'spi': 'driver',
+    'i2c': 'driver',
+    'uart': 'driver',
+    'serial': 'driver',
+    'analogwrite': 'driver',
+    'ledc': 'driver',
+    'pwm': 'driver',
+    'dac': 'driver',
+    'adc': 'driver',
+    'touch': 'driver',
+    'hall': 'driver',
+    'rtc': 'driver',
+    'timer': 'esp_timer',
+    'preferences': 'arduino_preferences',
+    'eeprom': 'arduino_eeprom',
+    'update': 'esp_https_ota',
+    'httpupdate': 'esp_https_ota',
+    'httpclient': 'esp_http_client',
+    'httpsclient': 'esp_https_ota',
+    'wifimanager': 'esp_wifi',
+    'wificlientsecure': 'esp_wifi',
+    'wifiserver': 'esp_wifi',
+    'wifiudp': 'esp_wifi',
+    'wificlient': 'esp_wifi',
+    'wifiap': 'esp_wifi',
+    'wifimulti': 'esp_wifi',
+    'esp32webserver': 'esp_http_server',
+    'webserver': 'esp_http_server',
+    'asyncwebserver': 'esp_http_server',
+    'dnsserver': 'lwip',
+    'netbios': 'netbios',
+    'simpletime': 'lwip',
+    'fs': 'vfs',
+    'sd': 'fatfs',
+    'sd_mmc': 'fatfs',
+    'littlefs': 'esp_littlefs',
+    'ffat': 'fatfs',
+    'camera': 'esp32_camera',
+    'esp_camera': 'esp32_camera',
+    'arducam': 'esp32_camera',
+    'rainmaker': 'esp_rainmaker',
+    'esp_rainmaker': 'esp_rainmaker',
+    'provisioning': 'wifi_provisioning',
+    'wifiprovisioning': 'wifi_provisioning',
+    'espnow': 'esp_now',
+    'esp_now': 'esp_now',
+    'esptouch': 'esp_smartconfig',
+    'ping': 'lwip',
+    'netif': 'lwip',
+    'tcpip': 'lwip',
+    'usb': 'arduino_tinyusb',
+    'tinyusb': 'arduino_tinyusb',
+    'dsp': 'espressif__esp-dsp',
+    'esp_dsp': 'espressif__esp-dsp',
+    'dsps': 'espressif__esp-dsp',
+    'fft2r': 'espressif__esp-dsp',
+    'dsps_fft2r': 'espressif__esp-dsp',
+    'esp-dsp': 'espressif__esp-dsp',
+    'espressif/esp-dsp': 'espressif__esp-dsp',
+    'espressif__esp-dsp': 'espressif__esp-dsp',
+}
+
+# lib_ignore names resolved without scanning the Arduino Core Libraries
+_DSP_PATTERNS = frozenset({
+    'dsp', 'esp_dsp', 'dsps', 'fft2r', 'dsps_fft2r', 'esp-dsp',
+    'espressif/esp-dsp', 'espressif__esp-dsp'
+})
+_BT_PATTERNS = frozenset({
+    'ble', 'bluetooth', 'bluetoothserial', 'simpleble', 'esp-nimble-cpp'
+})
+
+
+def _build_trie_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation matching any of the given words.
+
+    Common prefixes are factored out into a character trie, e.g. esp_timer
+    and esp_event become esp_(?:event|timer), so the regex engine doesn't
+    retry every word separately at each position.
+
+    Args:
+        words: Literal words to match
+
+    Returns:
+        Regex source of the alternation
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of word marker
+
+    def _emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + _emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        is_word_end = "" in node
+        if len(branches) == 1 and not is_word_end:
+            return branches[0]
+        group = f"(?:{'|'.join(branches)})"
+        return f"{group}?" if is_word_end else group
+
+    return _emit(trie)
+
 
 def _project_option(env, name):
     """Value of an optional project option, empty string when it is not set.
@@ -92,6 +249,14 @@ class ComponentManagerConfig:
         # Cache expensive operations using lazy loading
         self._arduino_framework_dir = None
         self._arduino_libs_mcu = None
+        # Per-run cache of os.stat results, None for missing paths
+        self._stat_cache: Dict[str, Optional[os.stat_result]] = {}
+        # Project option values, looked up once per key
+        self._option_cache: Dict[str, Any] = {}
+        # Text file contents keyed by path, with the (mtime_ns, size) they were read at
+        self._text_cache: Dict[str, Tuple[int, int, str]] = {}
+        # Set once pioarduino-build.py has a backup, cleared again on restore
+        self.build_py_backed_up = False
 
     @property
     def arduino_framework_dir(self):
@@ -115,9 +280,111 @@ class ComponentManagerConfig:
         """
         if self._arduino_libs_mcu is None:
             ald = self.platform.get_package_dir("framework-arduinoespressif32-libs")
-            self._arduino_libs_mcu = str(Path(ald) / self.chip_variant) if ald else ""
+            self._arduino_libs_mcu = os.path.join(ald, self.chip_variant) if ald else ""
         return self._arduino_libs_mcu
 
+    def get_option(self, name: str, default: Any = None) -> Any:
+        """
+        Cached lookup of a project option of the current environment.
+
+        List values are stored as tuples so that callers cannot modify
+        the cached value.
+
+        Args:
+            name: Project option name
+            default: Value returned when the option is not set
+
+        Returns:
+            Option value, or default if the option is not set
+        """
+        if name not in self._option_cache:
+            value = self.env.GetProjectOption(name, default)
+            if isinstance(value, list):
+                value = tuple(value)
+            self._option_cache[name] = value
+        return self._option_cache[name]
+
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        """
+        Cached os.stat of a path.
+
+        Args:
+            path: Path to stat
+
+        Returns:
+            Stat result, or None if the path does not exist
+        """
+        path = str(path)
+        if path not in self._stat_cache:
+            try:
+                self._stat_cache[path] = os.stat(path)
+            except OSError:
+                self._stat_cache[path] = None
+        return self._stat_cache[path]
+
+    def exists(self, path: str) -> bool:
+        """Cached equivalent of os.path.exists"""
+        return self._stat(path) is not None
+
+    def isdir(self, path: str) -> bool:
+        """Cached equivalent of os.path.isdir"""
+        st = self._stat(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
+
+    def isfile(self, path: str) -> bool:
+        """Cached equivalent of os.path.isfile"""
+        st = self._stat(path)
+        return st is not None and stat.S_ISREG(st.st_mode)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the cached stat of a path after creating or removing it.
+
+        Args:
+            path: Path whose cached state is outdated
+        """
+        self._stat_cache.pop(str(path), None)
+        self._text_cache.pop(str(path), None)
+
+    def read_text(self, path: str) -> str:
+        """
+        Read a UTF-8 text file, reusing the content of a previous read.
+
+        The cached content is used as long as the file's modification time
+        and size are unchanged, so the build script is read and decoded once
+        even though several handlers edit it.
+
+        Args:
+            path: Path of the file to read
+
+        Returns:
+            File content
+        """
+        path = str(path)
+        st = os.stat(path)
+        cached = self._text_cache.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self._text_cache[path] = (st.st_mtime_ns, st.st_size, content)
+        return content
+
+    def write_text(self, path: str, content: str) -> None:
+        """
+        Write a UTF-8 text file and keep its content cached for read_text().
+
+        Args:
+            path: Path of the file to write
+            content: New file content
+        """
+        path = str(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.invalidate(path)
+        st = os.stat(path)
+        self._text_cache[path] = (st.st_mtime_ns, st.st_size, content)
+
 
 class ComponentLogger:
     """
@@ -137,20 +404,45 @@ class ComponentLogger:
         """
         # List to store all change messages for summary reporting
         self.component_changes: List[str] = []
+        # Messages not yet written to the console
+        self._pending_output: List[str] = []
 
     def log_change(self, message: str) -> None:
         """
-        Log a change message with immediate console output.
+        Log a change message with buffered console output.
 
         Records the change message internally for summary reporting and
-        immediately prints it to the console with a component manager prefix
-        for real-time feedback during build operations.
+        queues it for the console with a component manager prefix. Queued
+        messages are written in one go by flush_pending() at the end of
+        each processing phase.
 
         Args:
             message: Descriptive message about the change or operation performed
         """
         self.component_changes.append(message)
-        print(f"[ComponentManager] {message}")
+        self._pending_output.append(f"[ComponentManager] {message}\n")
+
+    def flush_pending(self) -> None:
+        """
+        Write all queued messages to the console with a single write call.
+        """
+        if self._pending_output:
+            sys.stdout.write("".join(self._pending_output))
+            sys.stdout.flush()
+            self._pending_output.clear()
+
+    def print_message(self, message: str) -> None:
+        """
+        Print a message right away, after the queued messages.
+
+        Used for warnings and errors that are not recorded as changes,
+        flushing first keeps them behind the log lines leading up to them.
+
+        Args:
+            message: Message to print as is
+        """
+        self.flush_pending()
+        print(message)
 
     def get_changes_summary(self) -> List[str]:
         """
@@ -172,6 +464,7 @@ class ComponentLogger:
         were made, or a simple message indicating no changes occurred.
         Useful for end-of-build reporting and debugging.
         """
+        self.flush_pending()
         if self.component_changes:
             print("\n=== Component Manager Changes ===")
             for change in self.component_changes:
@@ -206,6 +499,12 @@ class ComponentHandler:
         self.logger = logger
         # Track removed components for cleanup operations
         self.removed_components: Set[str] = set()
+        # idf_component.yml path and parsed content, resolved on first use
+        self._component_yml_path: Optional[str] = None
+        self._component_data: Optional[Dict[str, Any]] = None
+        # CPPPATH cleanup pattern and the removed components it was built for
+        self._cpppath_pattern: Optional[Pattern] = None
+        self._cpppath_pattern_key: Optional[frozenset] = None
 
     def handle_component_settings(self, add_components: bool = False, remove_components: bool = False) -> None:
         """
@@ -227,13 +526,16 @@ class ComponentHandler:
         # Check if env and GetProjectOption are available
         if hasattr(self.config, 'env') and hasattr(self.config.env, 'GetProjectOption'):
             component_yml_path = self._get_or_create_component_yml()
-            component_data = self._load_component_yml(component_yml_path)
+            if self._component_data is None:
+                self._component_data = self._load_component_yml(component_yml_path)
+            component_data = self._component_data
+            dependencies = component_data.setdefault("dependencies", {})
 
             if remove_components:
-                self._process_component_removals(component_data)
+                self._process_component_removals(dependencies)
 
             if add_components:
-                self._process_component_additions(component_data)
+                self._process_component_additions(dependencies)
 
             self._save_component_yml(component_yml_path, component_data)
 
@@ -241,7 +543,7 @@ class ComponentHandler:
             if self.removed_components:
                 self._cleanup_removed_components()
 
-    def _process_component_removals(self, component_data: Dict[str, Any]) -> None:
+    def _process_component_removals(self, dependencies: Dict[str, Any]) -> None:
         """
         Process component removal requests from project configuration.
 
@@ -250,18 +552,18 @@ class ComponentHandler:
         Handles errors gracefully and logs all operations.
 
         Args:
-            component_data: Component configuration data dictionary containing dependencies
+            dependencies: Dependencies mapping of the component configuration
         """
         try:
-            remove_option = self.config.env.GetProjectOption("custom_component_remove", None)
+            remove_option = self.config.get_option("custom_component_remove", None)
             if remove_option:
                 # Split multiline option into individual components
                 components_to_remove = remove_option.splitlines()
-                self._remove_components(component_data, components_to_remove)
+                self._remove_components(dependencies, components_to_remove)
         except Exception as e:
             self.logger.log_change(f"Error removing components: {str(e)}")
 
-    def _process_component_additions(self, component_data: Dict[str, Any]) -> None:
+    def _process_component_additions(self, dependencies: Dict[str, Any]) -> None:
         """
         Process component addition requests from project configuration.
 
@@ -270,14 +572,14 @@ class ComponentHandler:
         Handles errors gracefully and logs all operations.
 
         Args:
-            component_data: Component configuration data dictionary containing dependencies
+            dependencies: Dependencies mapping of the component configuration
         """
         try:
-            add_option = self.config.env.GetProjectOption("custom_component_add", None)
+            add_option = self.config.get_option("custom_component_add", None)
             if add_option:
                 # Split multiline option into individual components
                 components_to_add = add_option.splitlines()
-                self._add_components(component_data, components_to_add)
+                self._add_components(dependencies, components_to_add)
         except Exception as e:
             self.logger.log_change(f"Error adding components: {str(e)}")
 
@@ -288,26 +590,38 @@ class ComponentHandler:
         Searches for existing idf_component.yml files in the Arduino framework
         directory first, then in the project source directory. If no file
         exists, creates a new one in the project source directory with
-        default content.
+        default content. The result is cached on the handler.
+
+        Returns:
+            Absolute path to the component YAML file
+        """
+        if self._component_yml_path is None:
+            self._component_yml_path = self._resolve_component_yml()
+        return self._component_yml_path
+
+    def _resolve_component_yml(self) -> str:
+        """
+        Locate or create idf_component.yml, backing up an existing file.
 
         Returns:
             Absolute path to the component YAML file
         """
         # Check Arduino framework directory first
         afd = self.config.arduino_framework_dir
-        framework_yml = str(Path(afd) / "idf_component.yml") if afd else ""
-        if framework_yml and os.path.exists(framework_yml):
+        framework_yml = os.path.join(afd, "idf_component.yml") if afd else ""
+        if framework_yml and self.config.exists(framework_yml):
             self._create_backup(framework_yml)
             return framework_yml
 
         # Try project source directory
-        project_yml = str(Path(self.config.project_src_dir) / "idf_component.yml")
-        if os.path.exists(project_yml):
+        project_yml = os.path.join(self.config.project_src_dir, "idf_component.yml")
+        if self.config.exists(project_yml):
             self._create_backup(project_yml)
             return project_yml
 
         # Create new file in project source
         self._create_default_component_yml(project_yml)
+        self.config.invalidate(project_yml)
         return project_yml
 
     def _create_backup(self, file_path: str) -> None:
@@ -322,8 +636,10 @@ class ComponentHandler:
             file_path: Absolute path to the file to backup
         """
         backup_path = f"{file_path}.orig"
-        if not os.path.exists(backup_path):
-            shutil.copy(file_path, backup_path)
+        if not self.config.exists(backup_path):
+            # Content only, permission bits are not needed for a backup
+            shutil.copyfile(file_path, backup_path)
+            self.config.invalidate(backup_path)
 
     def _create_default_component_yml(self, file_path: str) -> None:
         """
@@ -342,8 +658,9 @@ class ComponentHandler:
             }
         }
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(default_content, f)
+        with open(file_path, 'w', encoding='utf-8', buffering=65536) as f:
+            yaml.dump(default_content, f, Dumper=SafeDumper,
+                      default_flow_style=False, sort_keys=False)
 
     def _load_component_yml(self, file_path: str) -> Dict[str, Any]:
         """
@@ -378,12 +695,13 @@ class ComponentHandler:
             data: Component data dictionary to serialize
         """
         try:
-            with open(file_path, "w", encoding='utf-8') as f:
-                yaml.dump(data, f)
+            with open(file_path, "w", encoding='utf-8', buffering=65536) as f:
+                yaml.dump(data, f, Dumper=SafeDumper,
+                          default_flow_style=False, sort_keys=False)
         except Exception:
             pass
 
-    def _remove_components(self, component_data: Dict[str, Any], components_to_remove: list) -> None:
+    def _remove_components(self, dependencies: Dict[str, Any], components_to_remove: list) -> None:
         """
         Remove specified components from the configuration.
 
@@ -392,11 +710,9 @@ class ComponentHandler:
         components for later cleanup operations and logs all actions.
 
         Args:
-            component_data: Component configuration data dictionary
+            dependencies: Dependencies mapping of the component configuration
             components_to_remove: List of component names to remove
         """
-        dependencies = component_data.setdefault("dependencies", {})
-
         for component in components_to_remove:
             component = component.strip()
             if not component:
@@ -412,7 +728,7 @@ class ComponentHandler:
             else:
                 self.logger.log_change(f"Component not found: {component}")
 
-    def _add_components(self, component_data: Dict[str, Any], components_to_add: list) -> None:
+    def _add_components(self, dependencies: Dict[str, Any], components_to_add: list) -> None:
         """
         Add specified components to the configuration.
 
@@ -421,11 +737,9 @@ class ComponentHandler:
         already exist and filters out entries that are too short to be valid.
 
         Args:
-            component_data: Component configuration data dictionary
+            dependencies: Dependencies mapping of the component configuration
             components_to_add: List of component entries to add (format: name@version or name)
         """
-        dependencies = component_data.setdefault("dependencies", {})
-
         for component in components_to_add:
             component = component.strip()
             if not component:  # Skip empty entries
@@ -481,17 +795,24 @@ class ComponentHandler:
         making modifications. Only operates when Arduino framework is active
         and creates MCU-specific backup names to avoid conflicts.
         """
+        if self.config.build_py_backed_up:
+            return
+
         if "arduino" not in self.config.env.subst("$PIOFRAMEWORK"):
             return
 
         if not self.config.arduino_libs_mcu:
             return
 
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
-        backup_path = str(Path(self.config.arduino_libs_mcu) / f"pioarduino-build.py.{self.config.mcu}")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
+        backup_path = os.path.join(self.config.arduino_libs_mcu, f"pioarduino-build.py.{self.config.mcu}")
 
-        if os.path.exists(build_py_path) and not os.path.exists(backup_path):
+        if self.config.exists(build_py_path) and not self.config.exists(backup_path):
             shutil.copy2(build_py_path, backup_path)
+            self.config.invalidate(backup_path)
+
+        if self.config.exists(backup_path):
+            self.config.build_py_backed_up = True
 
     def _cleanup_removed_components(self) -> None:
         """
@@ -517,56 +838,78 @@ class ComponentHandler:
         Removes all component include directories efficiently without
         individual file system calls for each component.
         """
-        include_base_path = Path(self.config.arduino_libs_mcu) / "include"
+        include_base_path = os.path.join(self.config.arduino_libs_mcu, "include")
 
         for component in self.removed_components:
-            include_path = include_base_path / component
-            if include_path.exists():
+            include_path = os.path.join(include_base_path, component)
+            if self.config.exists(include_path):
                 try:
                     shutil.rmtree(include_path)
                 except OSError:
                     pass  # Continue with other components
+                self.config.invalidate(include_path)
+
+    def _get_cpppath_pattern(self) -> Pattern:
+        """
+        Get the compiled CPPPATH entry pattern for the removed components.
+
+        The pattern is compiled once and reused as long as the set of
+        removed components stays the same.
+
+        Returns:
+            Compiled regex matching a build script line with an include
+            entry of any removed component
+        """
+        key = frozenset(self.removed_components)
+        if self._cpppath_pattern is None or self._cpppath_pattern_key != key:
+            # Combined pattern for all components, shared prefixes factored out
+            component_pattern = _build_trie_regex(sorted(key))
+
+            # One alternation of all entry forms, each entry is a single line
+            self._cpppath_pattern = re.compile(
+                rf'(?:.*join\([^,]*,\s*"include",\s*"(?:{component_pattern})"[^)]*\),?\n)'
+                rf'|(?:.*"include/(?:{component_pattern})"[^,\n]*,?\n)'
+                rf'|(?:.*"[^"]*include[^"]*(?:{component_pattern})[^"]*"[^,\n]*,?\n)'
+            )
+            self._cpppath_pattern_key = key
+        return self._cpppath_pattern
 
     def _batch_remove_cpppath_entries(self) -> None:
         """
         Remove CPPPATH entries for all components in single optimized file pass.
 
-        Uses compiled regex patterns and processes all removed components
-        in a single pass through the build file for maximum efficiency.
+        Uses one compiled regex for all removed components and filters the
+        build file line by line, rewriting it only when entries were removed.
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
 
-        if not os.path.exists(build_py_path):
+        if not self.config.exists(build_py_path):
             return
 
         try:
-            with open(build_py_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            original_content = content
+            content = self.config.read_text(build_py_path)
 
-            # Create combined pattern for all components for maximum efficiency
-            escaped_components = [re.escape(comp) for comp in self.removed_components]
-            component_pattern = '|'.join(escaped_components)
+            # Plain substring search first, no regex work if no component occurs
+            if not any(comp in content for comp in self.removed_components):
+                return
 
-            # Compile patterns once for all components
-            combined_patterns = [
-                re.compile(rf'.*join\([^,]*,\s*"include",\s*"({component_pattern})"[^)]*\),?\n'),
-                re.compile(rf'.*"include/({component_pattern})"[^,\n]*,?\n'),
-                re.compile(rf'.*"[^"]*include[^"]*({component_pattern})[^"]*"[^,\n]*,?\n')
-            ]
+            line_pattern = self._get_cpppath_pattern()
 
-            # Apply all patterns in single pass
-            for pattern in combined_patterns:
-                content = pattern.sub('', content)
+            # Keep the lines that don't match
+            kept_lines = []
+            changed = False
+            for line in content.splitlines(keepends=True):
+                if line_pattern.match(line):
+                    changed = True
+                else:
+                    kept_lines.append(line)
 
             # Write changes if any were made
-            if content != original_content:
-                with open(build_py_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if changed:
+                self.config.write_text(build_py_path, "".join(kept_lines))
 
         except Exception as e:
-            print(f"[ComponentManager] Error updating build file during CPPPATH cleanup: {e!s}")
+            self.logger.print_message(f"[ComponentManager] Error updating build file during CPPPATH cleanup: {e!s}")
 
 
 class LibraryIgnoreHandler:
@@ -617,10 +960,15 @@ class LibraryIgnoreHandler:
             'BLE', 'BT', 'NIMBLE', 'BLUETOOTH', 'ESP32_BLE', 'ESP32BLE',
             'BLUETOOTHSERIAL', 'BLE_ARDUINO', 'ESP_BLE', 'ESP_BT'
         }
+        # All BT keywords in one regex, a single scan finds any of them
+        self._bt_re = re.compile('|'.join(re.escape(k) for k in sorted(self._bt_keywords)))
+        # lib_deps BT/BLE check result, computed on first use
+        self._bt_deps_result: Optional[bool] = None
 
         # Cache for expensive operations (lazy loaded)
         self._arduino_libraries_cache = None
         self._compiled_patterns_cache = {}
+        self._include_name_cache: Dict[str, str] = {}
         self._cleanup_patterns = None
 
     def handle_lib_ignore(self) -> None:
@@ -656,25 +1004,23 @@ class LibraryIgnoreHandler:
         """
         try:
             # Get lib_ignore from current environment only
-            lib_ignore = self.config.env.GetProjectOption("lib_ignore", [])
+            lib_ignore = self.config.get_option("lib_ignore", [])
 
             if isinstance(lib_ignore, str):
                 lib_ignore = [lib_ignore]
             elif lib_ignore is None:
                 lib_ignore = []
 
-            # Clean and normalize entries
-            cleaned_entries = []
-            for entry in lib_ignore:
-                entry = str(entry).strip()
-                if entry:
-                    # Convert library names to potential include directory names
-                    include_name = self._convert_lib_name_to_include(entry)
-                    # Use optimized set lookup for critical components check (O(1) vs O(n))
-                    if include_name not in self._critical_components:
-                        cleaned_entries.append(include_name)
+            # Clean and normalize entries, converting library names to potential
+            # include directory names and skipping critical components (set lookup)
+            cleaned_entries = {
+                include_name
+                for entry in (str(item).strip() for item in lib_ignore) if entry
+                if (include_name := self._convert_lib_name_to_include(entry))
+                not in self._critical_components
+            }
 
-            return sorted(set(cleaned_entries))
+            return sorted(cleaned_entries)
 
         except Exception:
             return []
@@ -690,21 +1036,26 @@ class LibraryIgnoreHandler:
         Returns:
             True if BT/BLE dependencies are found in lib_deps
         """
+        if self._bt_deps_result is not None:
+            return self._bt_deps_result
+
         try:
             # Get lib_deps from current environment
-            lib_deps = self.config.env.GetProjectOption("lib_deps", [])
+            lib_deps = self.config.get_option("lib_deps", [])
 
             if isinstance(lib_deps, str):
                 lib_deps = [lib_deps]
             elif lib_deps is None:
                 lib_deps = []
 
-            # Convert to string and check for BT/BLE keywords using set intersection
+            # Convert to string and check for BT/BLE keywords in one regex scan
             lib_deps_str = ' '.join(str(dep) for dep in lib_deps).upper()
-            return any(keyword in lib_deps_str for keyword in self._bt_keywords)
+            self._bt_deps_result = self._bt_re.search(lib_deps_str) is not None
 
         except Exception:
-            return False
+            self._bt_deps_result = False
+
+        return self._bt_deps_result
 
     def _is_bt_related_library(self, lib_name: str) -> bool:
         """
@@ -720,8 +1071,7 @@ class LibraryIgnoreHandler:
         Returns:
             True if library name contains BT/BLE related keywords
         """
-        lib_name_upper = lib_name.upper()
-        return any(bt_keyword in lib_name_upper for bt_keyword in self._bt_keywords)
+        return self._bt_re.search(lib_name.upper()) is not None
 
     def _get_arduino_core_libraries(self) -> Dict[str, str]:
         """
@@ -734,26 +1084,36 @@ class LibraryIgnoreHandler:
         Returns:
             Dictionary mapping library names to include directory names
         """
-        libraries_mapping = {}
+        # The framework libraries don't change during a build, scan only once
+        if self._arduino_libraries_cache is not None:
+            return self._arduino_libraries_cache
+
+        self._arduino_libraries_cache = libraries_mapping = {}
 
         # Path to Arduino Core Libraries
         afd = self.config.arduino_framework_dir
         if not afd:
             return libraries_mapping
-        arduino_libs_dir = str(Path(afd).resolve() / "libraries")
+        arduino_libs_dir = os.path.join(os.path.realpath(afd), "libraries")
 
-        if not os.path.exists(arduino_libs_dir):
+        if not self.config.exists(arduino_libs_dir):
             return libraries_mapping
 
         try:
-            for entry in os.listdir(arduino_libs_dir):
-                lib_path = str(Path(arduino_libs_dir) / entry)
-                if os.path.isdir(lib_path):
-                    lib_name = self._get_library_name_from_properties(lib_path)
+            # scandir provides the entry type without an extra stat per child
+            with os.scandir(arduino_libs_dir) as it:
+                lib_dirs = [entry for entry in it if entry.is_dir()]
+            # Reading the properties files is I/O bound, read them concurrently.
+            # map() keeps the directory order, so the mapping stays deterministic.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                lib_names = executor.map(
+                    self._get_library_name_from_properties,
+                    [entry.path for entry in lib_dirs])
+                for entry, lib_name in zip(lib_dirs, lib_names):
                     if lib_name:
-                        include_path = self._map_library_to_include_path(lib_name, entry)
+                        include_path = self._map_library_to_include_path(lib_name, entry.name)
                         libraries_mapping[lib_name.lower()] = include_path
-                        libraries_mapping[entry.lower()] = include_path  # Also use directory name as key
+                        libraries_mapping[entry.name.lower()] = include_path  # Also use directory name as key
         except Exception:
             pass
 
@@ -772,28 +1132,31 @@ class LibraryIgnoreHandler:
         Returns:
             Official library name or None if not found or readable
         """
-        prop_path = str(Path(lib_dir) / "library.properties")
-        if not os.path.isfile(prop_path):
+        prop_path = os.path.join(lib_dir, "library.properties")
+        if not self.config.isfile(prop_path):
             return None
 
         try:
-            with open(prop_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('name='):
-                        return line.split('=', 1)[1].strip()
+            # Single read and one regex search, only the value gets decoded
+            with open(prop_path, 'rb') as f:
+                match = _PROPERTIES_NAME_RE.search(f.read())
+            if match:
+                return match.group(1).decode('utf-8').strip()
         except Exception:
             pass
 
         return None
 
-    def _map_library_to_include_path(self, lib_name: str, dir_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _map_library_to_include_path(lib_name: str, dir_name: str) -> str:
         """
         Map library name to corresponding include path.
 
         Converts Arduino library names to their corresponding ESP-IDF
         component include paths using an extensive mapping table.
         Handles common Arduino libraries and their ESP-IDF equivalents.
+        Depends only on its arguments, so results are memoized.
 
         Args:
             lib_name: Official library name from library.properties
@@ -802,110 +1165,16 @@ class LibraryIgnoreHandler:
         Returns:
             Corresponding ESP-IDF component include path name
         """
-        lib_name_lower = lib_name.lower().replace(' ', '').replace('-', '_')
+        lib_name_lower = lib_name.lower().translate(_LIB_NAME_TABLE)
         dir_name_lower = dir_name.lower()
 
-        # Extended mapping list with Arduino Core Libraries
-        extended_mapping = {
-            # Core ESP32 mappings
-            'wifi': 'esp_wifi',
-            'bluetooth': 'bt',
-            'bluetoothserial': 'bt',
-            'ble': 'bt',
-            'bt': 'bt',
-            'ethernet': 'esp_eth',
-            'websocket': 'esp_websocket_client',
-            'http': 'esp_http_client',
-            'https': 'esp_https_ota',
-            'ota': 'esp_https_ota',
-            'spiffs': 'spiffs',
-            'fatfs': 'fatfs',
-            'mesh': 'esp_wifi_mesh',
-            'smartconfig': 'esp_smartconfig',
-            'mdns': 'mdns',
-            'coap': 'coap',
-            'mqtt': 'mqtt',
-            'json': 'cjson',
-            'mbedtls': 'mbedtls',
-            'openssl': 'openssl',
-
-            # Arduino Core specific mappings (safe mappings that don't conflict with critical components)
-            'esp32blearduino': 'bt',
-            'esp32_ble_arduino': 'bt',
-            'simpleble': 'bt',
-            'esp_nimble_cpp': 'bt',
-            'nimble_arduino': 'bt',
-            'esp32': 'esp32',
-            'wire': 'driver',
-            'spi': 'driver',
-            'i2c': 'driver',
-            'uart': 'driver',
-            'serial': 'driver',
-            'analogwrite': 'driver',
-            'ledc': 'driver',
-            'pwm': 'driver',
-            'dac': 'driver',
-            'adc': 'driver',
-            'touch': 'driver',
-            'hall': 'driver',
-            'rtc': 'driver',
-            'timer': 'esp_timer',
-            'preferences': 'arduino_preferences',
-            'eeprom': 'arduino_eeprom',
-            'update': 'esp_https_ota',
-            'httpupdate': 'esp_https_ota',
-            'httpclient': 'esp_http_client',
-            'httpsclient': 'esp_https_ota',
-            'wifimanager': 'esp_wifi',
-            'wificlientsecure': 'esp_wifi',
-            'wifiserver': 'esp_wifi',
-            'wifiudp': 'esp_wifi',
-            'wificlient': 'esp_wifi',
-            'wifiap': 'esp_wifi',
-            'wifimulti': 'esp_wifi',
-            'esp32webserver': 'esp_http_server',
-            'webserver': 'esp_http_server',
-            'asyncwebserver': 'esp_http_server',
-            'dnsserver': 'lwip',
-            'netbios': 'netbios',
-            'simpletime': 'lwip',
-            'fs': 'vfs',
-            'sd': 'fatfs',
-            'sd_mmc': 'fatfs',
-            'littlefs': 'esp_littlefs',
-            'ffat': 'fatfs',
-            'camera': 'esp32_camera',
-            'esp_camera': 'esp32_camera',
-            'arducam': 'esp32_camera',
-            'rainmaker': 'esp_rainmaker',
-            'esp_rainmaker': 'esp_rainmaker',
-            'provisioning': 'wifi_provisioning',
-            'wifiprovisioning': 'wifi_provisioning',
-            'espnow': 'esp_now',
-            'esp_now': 'esp_now',
-            'esptouch': 'esp_smartconfig',
-            'ping': 'lwip',
-            'netif': 'lwip',
-            'tcpip': 'lwip',
-            'usb': 'arduino_tinyusb',
-            'tinyusb': 'arduino_tinyusb',
-            'dsp': 'espressif__esp-dsp',
-            'esp_dsp': 'espressif__esp-dsp',
-            'dsps': 'espressif__esp-dsp',
-            'fft2r': 'espressif__esp-dsp',
-            'dsps_fft2r': 'espressif__esp-dsp',
-            'esp-dsp': 'espressif__esp-dsp',
-            'espressif/esp-dsp': 'espressif__esp-dsp',
-            'espressif__esp-dsp': 'espressif__esp-dsp'
-        }
-
         # Check extended mapping first
-        if lib_name_lower in extended_mapping:
-            return extended_mapping[lib_name_lower]
+        if lib_name_lower in _EXTENDED_MAPPING:
+            return _EXTENDED_MAPPING[lib_name_lower]
 
         # Check directory name
-        if dir_name_lower in extended_mapping:
-            return extended_mapping[dir_name_lower]
+        if dir_name_lower in _EXTENDED_MAPPING:
+            return _EXTENDED_MAPPING[dir_name_lower]
 
         # Fallback: Use directory name as include path
         return dir_name_lower
@@ -919,6 +1188,22 @@ class LibraryIgnoreHandler:
         core library mappings and common naming conventions with
         performance optimizations for common cases like DSP.
 
+        Args:
+            lib_name: Library name from lib_ignore configuration
+
+        Returns:
+            Converted include directory name for path removal
+        """
+        # Repeated names are served from the per-handler cache
+        include_name = self._include_name_cache.get(lib_name)
+        if include_name is None:
+            include_name = self._include_name_cache[lib_name] = self._convert_lib_name(lib_name)
+        return include_name
+
+    def _convert_lib_name(self, lib_name: str) -> str:
+        """
+        Uncached conversion of a library name to its include directory name.
+
         Args:
             lib_name: Library name from lib_ignore configuration
 
@@ -928,27 +1213,17 @@ class LibraryIgnoreHandler:
         lib_name_lower = lib_name.lower()
 
         # Fast path optimization for DSP components (most performance-critical case)
-        dsp_patterns = {
-            'dsp', 'esp_dsp', 'dsps', 'fft2r', 'dsps_fft2r', 'esp-dsp',
-            'espressif/esp-dsp', 'espressif__esp-dsp'
-        }
-        if lib_name_lower in dsp_patterns:
+        if lib_name_lower in _DSP_PATTERNS:
             return 'espressif__esp-dsp'
 
         # Fast path for BT components
-        bt_patterns = {
-            'ble', 'bluetooth', 'bluetoothserial', 'simpleble', 'esp-nimble-cpp'
-        }
-        if lib_name_lower in bt_patterns:
+        if lib_name_lower in _BT_PATTERNS:
             return 'bt'
 
-        # Load Arduino Core Libraries on first call (lazy loading)
-        if self._arduino_libraries_cache is None:
-            self._arduino_libraries_cache = self._get_arduino_core_libraries()
-
-        # Check Arduino Core Libraries cache
-        if lib_name_lower in self._arduino_libraries_cache:
-            return self._arduino_libraries_cache[lib_name_lower]
+        # Check Arduino Core Libraries, scanned on first call (lazy loading)
+        arduino_libraries = self._get_arduino_core_libraries()
+        if lib_name_lower in arduino_libraries:
+            return arduino_libraries[lib_name_lower]
 
         # Continue with full conversion logic for less common cases
         return self._full_conversion_logic(lib_name_lower)
@@ -964,19 +1239,8 @@ class LibraryIgnoreHandler:
             Converted include directory name
         """
         # Remove common prefixes and suffixes
-        cleaned_name = lib_name_lower
-
-        # Remove common prefixes
-        prefixes_to_remove = ['lib', 'arduino-', 'esp32-', 'esp-']
-        for prefix in prefixes_to_remove:
-            if cleaned_name.startswith(prefix):
-                cleaned_name = cleaned_name[len(prefix):]
-
-        # Remove common suffixes
-        suffixes_to_remove = ['-lib', '-library', '.h']
-        for suffix in suffixes_to_remove:
-            if cleaned_name.endswith(suffix):
-                cleaned_name = cleaned_name[:-len(suffix)]
+        cleaned_name = _LIB_PREFIX_RE.sub('', lib_name_lower, count=1)
+        cleaned_name = _LIB_SUFFIX_RE.sub('', cleaned_name, count=1)
 
         # Check again with cleaned name
         if cleaned_name in self._arduino_libraries_cache:
@@ -1036,9 +1300,9 @@ class LibraryIgnoreHandler:
         all ignored libraries using compiled regex patterns and batch processing.
         Implements protection for BT/BLE components when dependencies are detected.
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
 
-        if not os.path.exists(build_py_path):
+        if not self.config.exists(build_py_path):
             self.logger.log_change("Build file not found")
             return
 
@@ -1048,9 +1312,8 @@ class LibraryIgnoreHandler:
             self.logger.log_change("BT/BLE protection enabled")
 
         try:
-            # Read file once
-            with open(build_py_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read file once (cached across handlers)
+            content = self.config.read_text(build_py_path)
 
             original_content = content
             total_removed = 0
@@ -1073,8 +1336,7 @@ class LibraryIgnoreHandler:
 
                 # Validate and write changes
                 if self._validate_changes(original_content, content):
-                    with open(build_py_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    self.config.write_text(build_py_path, content)
                     self.logger.log_change(f"Updated build file ({total_removed} total removals)")
 
         except Exception as e:
@@ -1093,15 +1355,20 @@ class LibraryIgnoreHandler:
         """
         total_removed = 0
 
+        # Libraries are applied one after the other: the pattern matching
+        # "[\\/]name[\\/]" also consumes preceding newlines, so the result
+        # depends on the order in which the entries are removed
         for lib_name in libs_to_process:
-            patterns = self._get_compiled_patterns(lib_name)
-            removed_count = 0
+            # Patterns match the name literally and case-sensitively, a name
+            # absent from the current content can't match any of them
+            if lib_name not in content:
+                continue
 
-            for pattern in patterns:
-                matches = pattern.findall(content)
-                if matches:
-                    content = pattern.sub('', content)
-                    removed_count += len(matches)
+            removed_count = 0
+            for pattern in self._get_compiled_patterns(lib_name):
+                # subn counts while substituting, a single scan per pattern
+                content, count = pattern.subn('', content)
+                removed_count += count
 
             if removed_count > 0:
                 self.logger.log_change(f"Ignored library: {lib_name} ({removed_count} entries)")
@@ -1150,17 +1417,24 @@ class LibraryIgnoreHandler:
         making modifications. Only operates when Arduino framework is active
         and creates MCU-specific backup names to avoid conflicts.
         """
+        if self.config.build_py_backed_up:
+            return
+
         if "arduino" not in self.config.env.subst("$PIOFRAMEWORK"):
             return
 
         if not self.config.arduino_libs_mcu:
             return
 
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
-        backup_path = str(Path(self.config.arduino_libs_mcu) / f"pioarduino-build.py.{self.config.mcu}")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
+        backup_path = os.path.join(self.config.arduino_libs_mcu, f"pioarduino-build.py.{self.config.mcu}")
 
-        if os.path.exists(build_py_path) and not os.path.exists(backup_path):
+        if self.config.exists(build_py_path) and not self.config.exists(backup_path):
             shutil.copy2(build_py_path, backup_path)
+            self.config.invalidate(backup_path)
+
+        if self.config.exists(backup_path):
+            self.config.build_py_backed_up = True
 
 
 class BackupManager:
@@ -1192,14 +1466,21 @@ class BackupManager:
         with MCU-specific naming to prevent conflicts between different
         ESP32 variants. Only creates backup if it doesn't already exist.
         """
+        if self.config.build_py_backed_up:
+            return
+
         if "arduino" not in self.config.env.subst("$PIOFRAMEWORK"):
             return
 
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
-        backup_path = str(Path(self.config.arduino_libs_mcu) / f"pioarduino-build.py.{self.config.mcu}")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
+        backup_path = os.path.join(self.config.arduino_libs_mcu, f"pioarduino-build.py.{self.config.mcu}")
 
-        if os.path.exists(build_py_path) and not os.path.exists(backup_path):
+        if self.config.exists(build_py_path) and not self.config.exists(backup_path):
             shutil.copy2(build_py_path, backup_path)
+            self.config.invalidate(backup_path)
+
+        if self.config.exists(backup_path):
+            self.config.build_py_backed_up = True
 
     def restore_pioarduino_build_py(self, target=None, source=None, env=None) -> None:
         """
@@ -1214,12 +1495,15 @@ class BackupManager:
             source: Build source (unused, for PlatformIO compatibility)
             env: Environment (unused, for PlatformIO compatibility)
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
-        backup_path = str(Path(self.config.arduino_libs_mcu) / f"pioarduino-build.py.{self.config.mcu}")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
+        backup_path = os.path.join(self.config.arduino_libs_mcu, f"pioarduino-build.py.{self.config.mcu}")
 
         if os.path.exists(backup_path):
             shutil.copy2(backup_path, build_py_path)
             os.remove(backup_path)
+            self.config.invalidate(backup_path)
+            self.config.invalidate(build_py_path)
+            self.config.build_py_backed_up = False
 
 
 class ComponentManager:
@@ -1262,12 +1546,14 @@ class ComponentManager:
             remove_components: Whether to process component removals from configuration
         """
         self.component_handler.handle_component_settings(add_components, remove_components)
+        self.logger.flush_pending()
         self.library_handler.handle_lib_ignore()
 
         # Print summary
         changes = self.logger.get_changes_summary()
         if changes:
             self.logger.log_change(f"Session completed with {len(changes)} changes")
+        self.logger.flush_pending()
 
     def handle_lib_ignore(self) -> None:
         """
@@ -1277,6 +1563,7 @@ class ComponentManager:
         where only library handling is needed without component operations.
         """
         self.library_handler.handle_lib_ignore()
+        self.logger.flush_pending()
 
     def restore_pioarduino_build_py(self, target=None, source=None, env=None) -> None:
         """
@@ -1323,15 +1610,14 @@ class ComponentManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
 
-        if not os.path.exists(build_py_path):
-            print(f"Warning: pioarduino-build.py not found at {build_py_path}")
+        if not self.config.exists(build_py_path):
+            self.logger.print_message(f"Warning: pioarduino-build.py not found at {build_py_path}")
             return False
 
         try:
-            with open(build_py_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.config.read_text(build_py_path)
 
             # Remove all -fno-lto flags
             modified_content = re.sub(r'["\']?-fno-lto["\']?,?\s*', '', content)
@@ -1341,13 +1627,12 @@ class ComponentManager:
             modified_content = re.sub(r'\[\s*,', '[', modified_content)
             modified_content = re.sub(r',\s*\]', ']', modified_content)
 
-            with open(build_py_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            self.config.write_text(build_py_path, modified_content)
 
             return True
 
         except (IOError, OSError) as e:
-            print(f"Error removing -fno-lto flags: {e}")
+            self.logger.print_message(f"Error removing -fno-lto flags: {e}")
             return False
 
     def apply_picolibc_flags(self) -> bool:
@@ -1362,15 +1647,14 @@ class ComponentManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
 
-        if not os.path.exists(build_py_path):
-            print(f"Warning: pioarduino-build.py not found at {build_py_path}")
+        if not self.config.exists(build_py_path):
+            self.logger.print_message(f"Warning: pioarduino-build.py not found at {build_py_path}")
             return False
 
         try:
-            with open(build_py_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.config.read_text(build_py_path)
 
             # Idempotency guard: exit early if picolibc.specs is already present
             if '-specs=picolibc.specs' in content:
@@ -1433,14 +1717,13 @@ class ComponentManager:
             content = re.sub(r',\s*\]', ']', content)
 
             if modified:
-                with open(build_py_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self.config.write_text(build_py_path, content)
 
-                print("*** Applied picolibc flags for Arduino compile ***")
+                self.logger.print_message("*** Applied picolibc flags for Arduino compile ***")
             return True
 
         except (IOError, OSError) as e:
-            print(f"Error applying picolibc flags: {e}")
+            self.logger.print_message(f"Error applying picolibc flags: {e}")
             return False
 
     def add_lto_flags(self) -> bool:
@@ -1453,15 +1736,14 @@ class ComponentManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        build_py_path = str(Path(self.config.arduino_libs_mcu) / "pioarduino-build.py")
+        build_py_path = os.path.join(self.config.arduino_libs_mcu, "pioarduino-build.py")
 
-        if not os.path.exists(build_py_path):
-            print(f"Warning: pioarduino-build.py not found at {build_py_path}")
+        if not self.config.exists(build_py_path):
+            self.logger.print_message(f"Warning: pioarduino-build.py not found at {build_py_path}")
             return False
 
         try:
-            with open(build_py_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.config.read_text(build_py_path)
 
             modified = False
 
@@ -1502,12 +1784,11 @@ class ComponentManager:
                 modified = True
 
             if modified:
-                with open(build_py_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self.config.write_text(build_py_path, content)
 
-                print("*** Added LTO flags for Arduino compile ***")
+                self.logger.print_message("*** Added LTO flags for Arduino compile ***")
                 return True
 
         except (IOError, OSError) as e:
-            print(f"Error adding LTO flags: {e}")
+            self.logger.print_message(f"Error adding LTO flags: {e}")
             return False
@@ -29,6 +29,7 @@ import requests
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlsplit, unquote
 
@@ -233,6 +234,28 @@ def get_requested_cli_targets():
             normalized.append(cleaned)
     return normalized
 
+
+def copytree_parallel(src, dst):
+    """Copy a directory tree, with the file copies spread over a thread pool."""
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        futures = []
+        # copytree creates the directories, the pool copies the files
+        shutil.copytree(
+            src,
+            dst,
+            dirs_exist_ok=True,
+            copy_function=lambda s, d: futures.append(
+                executor.submit(shutil.copy2, s, d)),
+        )
+        for future in futures:
+            future.result()
+
+    # The pooled file copies ran after copytree had set the directory stats
+    # and changed the mtimes again, so copy the directory stats once more
+    for dirpath, _, _ in os.walk(src, topdown=False, followlinks=True):
+        shutil.copystat(dirpath, os.path.join(dst, os.path.relpath(dirpath, src)))
+
+
 if "arduino" in env.subst("$PIOFRAMEWORK"):
     _arduino_pkg_dir = platform.get_package_dir("framework-arduinoespressif32")
     if not _arduino_pkg_dir or not os.path.isdir(_arduino_pkg_dir):
@@ -269,7 +292,7 @@ if "arduino" in env.subst("$PIOFRAMEWORK"):
                 env.Exit(1)
             arduino_c2_dir = Path(_arduino_c2_dir)
             ARDUINO_C2_DIR = str(arduino_c2_dir / chip_variant)
-            shutil.copytree(ARDUINO_C2_DIR, ARDUINO_FRMWRK_C2_LIB_DIR, dirs_exist_ok=True)
+            copytree_parallel(ARDUINO_C2_DIR, ARDUINO_FRMWRK_C2_LIB_DIR)
 
     if mcu == "esp32c61" and "espidf" not in pio_orig_frwrk:
         ARDUINO_FRMWRK_C61_LIB_DIR = str(ARDUINO_FRMWRK_LIB_DIR_PATH / chip_variant)
@@ -280,7 +303,7 @@ if "arduino" in env.subst("$PIOFRAMEWORK"):
                 env.Exit(1)
             arduino_c61_dir = Path(_arduino_c61_dir)
             ARDUINO_C61_DIR = str(arduino_c61_dir / chip_variant)
-            shutil.copytree(ARDUINO_C61_DIR, ARDUINO_FRMWRK_C61_LIB_DIR, dirs_exist_ok=True)
+            copytree_parallel(ARDUINO_C61_DIR, ARDUINO_FRMWRK_C61_LIB_DIR)
 
     arduino_libs_mcu = str(ARDUINO_FRMWRK_LIB_DIR_PATH / chip_variant)
 
@@ -356,10 +379,10 @@ def HandleArduinoIDFsettings(env):
     Handles Arduino IDF settings configuration with custom sdkconfig support.
     """
     
-    def get_MD5_hash(phrase):
-        """Generate MD5 hash for checksum validation."""
+    def get_sdkconfig_checksum(phrase):
+        """Generate 16 hex char BLAKE2b hash for checksum validation."""
         import hashlib
-        return hashlib.md5(phrase.encode('utf-8')).hexdigest()[:16]
+        return hashlib.blake2b(phrase.encode('utf-8'), digest_size=8).hexdigest()
 
     def load_custom_sdkconfig_file():
         """Load custom sdkconfig from file or URL if specified."""
@@ -817,8 +840,8 @@ def HandleArduinoIDFsettings(env):
             env.Exit(1)
         
         # Generate checksum for validation (maintains original logic)
-        checksum = get_MD5_hash(checksum_source.strip() + mcu
-                                + board_memory_fingerprint(env, board))
+        checksum = get_sdkconfig_checksum(checksum_source.strip() + mcu
+                                          + board_memory_fingerprint(env, board))
         
         with open(sdkconfig_src, 'r', encoding='utf-8') as src, open(sdkconfig_dst, 'w', encoding='utf-8') as dst:
             # Write checksum header (critical for compilation decision logic)
@@ -2406,35 +2429,52 @@ def install_python_deps(deps=None):
     deps = deps or _get_python_deps()
 
     def _get_installed_uv_packages(python_exe_path):
-        result = {}
         try:
-            uv_output = subprocess.check_output([
-                UV_EXE, "pip", "list", "--python", python_exe_path, "--format=json"
-            ])
-            packages = json.loads(uv_output)
-        except (subprocess.CalledProcessError, json.JSONDecodeError, OSError) as e:
+            uv_result = subprocess.run(
+                [UV_EXE, "pip", "list", "--python", python_exe_path, "--format=json"],
+                capture_output=True,
+                check=True,
+                timeout=120,
+            )
+            packages = _penv_setup.json_loads(uv_result.stdout)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired,
+                ValueError, OSError) as e:
             print(f"Warning! Couldn't extract the list of installed Python packages: {e}")
             return {}
-        
-        for p in packages:
-            result[p["name"]] = pepver_to_semver(p["version"])
 
-        return result
+        return {
+            _penv_setup.canonicalize_package_name(p["name"]): pepver_to_semver(p["version"])
+            for p in packages
+        }
+
+    # Parsed once, the specs are matched against both package listings below
+    version_specs = {
+        package: semantic_version.Spec(spec) for package, spec in deps.items() if spec
+    }
+
+    def _get_packages_to_install(installed_packages):
+        packages_to_install = []
+        for package in deps:
+            name = _penv_setup.canonicalize_package_name(package)
+            if name not in installed_packages:
+                packages_to_install.append(package)
+            elif package in version_specs:
+                if not version_specs[package].match(installed_packages[name]):
+                    packages_to_install.append(package)
+        return packages_to_install
 
     skip_python_packages = str(Path(FRAMEWORK_DIR) / ".pio_skip_pypackages")
     if os.path.isfile(skip_python_packages):
         return
 
     python_exe_path = get_python_exe()
-    installed_packages = _get_installed_uv_packages(python_exe_path)
-    packages_to_install = []
-    for package, spec in deps.items():
-        if package not in installed_packages:
-            packages_to_install.append(package)
-        elif spec:
-            version_spec = semantic_version.Spec(spec)
-            if not version_spec.match(installed_packages[package]):
-                packages_to_install.append(package)
+    # Fast path: read package metadata of the IDF venv in-process. Only when
+    # something looks missing or outdated, confirm it with uv before installing.
+    installed_packages = _penv_setup.get_installed_packages(get_idf_venv_dir(), deps)
+    packages_to_install = _get_packages_to_install(installed_packages or {})
+    if installed_packages is None or packages_to_install:
+        packages_to_install = _get_packages_to_install(
+            _get_installed_uv_packages(python_exe_path))
 
     if packages_to_install:
         packages_str = " ".join(['"%s%s"' % (p, deps[p]) for p in packages_to_install])
@@ -2564,7 +2604,8 @@ def ensure_python_venv_available():
 
     if recreate:
         _recreate_and_save(venv_dir, deps, venv_data_file)
-    else:
+    elif not env.IsIntegrationDump():
+        # IDE integration dumps only need a usable venv, skip the dependency check
         install_python_deps(deps)
 
 
@@ -2825,8 +2866,10 @@ except (ValueError, IndexError):
 
 # Remove project source files from following build stages as they're
 # built as part of the framework
+project_src_resolved = Path(PROJECT_SRC_DIR).resolve()
+
+
 def _skip_prj_source_files(node):
-    project_src_resolved = Path(PROJECT_SRC_DIR).resolve()
     node_path_resolved = Path(node.srcnode().get_path()).resolve()
     try:
         node_path_resolved.relative_to(project_src_resolved)
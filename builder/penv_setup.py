@@ -12,20 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import json
 import os
-import semantic_version
+import re
 import shutil
 import site
 import socket
 import subprocess
 import sys
+from functools import lru_cache
+from importlib.metadata import distributions
 from pathlib import Path
 from urllib.parse import urlparse
 
 from platformio.package.version import pepver_to_semver
 from platformio.compat import IS_WINDOWS
 
+try:
+    # Optional, noticeably faster when parsing large package listings
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 GDB_TOOL_PACKAGES = {
     "xtensa": "tool-xtensa-esp-elf-gdb",
     "riscv": "tool-riscv32-esp-elf-gdb",
@@ -42,6 +51,10 @@ if sys.version_info < (3, 10):
 
 github_actions = bool(os.getenv("GITHUB_ACTIONS"))
 
+# Fingerprints of already satisfied dependency sets, stored inside the penv
+DEPS_STAMP_FILE = ".pydeps.stamp"
+DEPS_STAMP_MAX_ENTRIES = 8
+
 # Python dependencies required for ESP32 platform builds
 python_deps = {
     "pioarduino": ">=6.1.19",
@@ -325,21 +338,35 @@ def setup_python_paths(penv_dir):
         sys.path.insert(0, site_packages)
 
 
+def canonicalize_package_name(name):
+    """Normalize a distribution name as specified by PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@lru_cache(maxsize=None)
+def _get_version_spec(spec):
+    """Parse a version specification once per distinct spec string."""
+    # Imported lazily, only needed when a version has to be compared
+    import semantic_version
+    return semantic_version.SimpleSpec(spec)
+
+
 def get_packages_to_install(deps, installed_packages):
     """
     Generator for Python packages that need to be installed.
-    Compares package names case-insensitively.
+    Compares package names by their PEP 503 canonical form.
     Handles both semantic version specs and direct URLs (git+, http, etc.).
 
     Args:
         deps (dict): Dictionary of package names and version specifications
-        installed_packages (dict): Dictionary of currently installed packages (keys should be lowercase)
+        installed_packages (dict): Dictionary of currently installed packages
+            (keys should be PEP 503 canonical names)
 
     Yields:
         str: Package name that needs to be installed
     """
     for package, spec in deps.items():
-        name = package.lower()
+        name = canonicalize_package_name(package)
         if name not in installed_packages:
             yield package
         elif spec.startswith(('http://', 'https://', 'git+', 'file://')):
@@ -348,11 +375,97 @@ def get_packages_to_install(deps, installed_packages):
             # use `uv pip install --upgrade` separately to refresh on demand.
             continue
         else:
-            version_spec = semantic_version.SimpleSpec(spec)
-            if not version_spec.match(installed_packages[name]):
+            if not _get_version_spec(spec).match(installed_packages[name]):
                 yield package
 
 
+def get_installed_packages(venv_dir, package_names):
+    """
+    Look up installed versions of the given packages in a virtual environment.
+
+    Reads the distribution metadata of the venv's site-packages in-process
+    instead of spawning a package manager, and touches only the metadata
+    of the requested packages.
+
+    Args:
+        venv_dir (str): Path to the virtual environment to inspect
+        package_names (Iterable[str]): Package names to look up
+
+    Returns:
+        dict | None: Canonical package names mapped to their semantic versions,
+        or None if the venv site-packages directory cannot be located
+    """
+    site_packages = _get_penv_site_packages(venv_dir)
+    if not site_packages:
+        return None
+
+    result = {}
+    for package in package_names:
+        dist = next(iter(distributions(name=package, path=[site_packages])), None)
+        if dist is None:
+            continue
+        try:
+            result[canonicalize_package_name(package)] = pepver_to_semver(dist.version)
+        except Exception as e:
+            print(f"Warning: Could not parse version of {package}: {e}")
+    return result
+
+
+def _get_deps_stamp_key(python_exe, deps):
+    """
+    Compute a fingerprint of the dependency set and the penv state.
+
+    The modification times of the Python executable and of the penv
+    site-packages directory change whenever the penv is recreated or a
+    distribution is added, upgraded or removed, which invalidates the key.
+    The penv's uv executable is part of the key as well, so a penv whose
+    uv was removed or replaced is not taken as healthy.
+
+    Returns:
+        str | None: Hex digest, or None if the penv state cannot be determined
+    """
+    penv_dir = os.path.dirname(os.path.dirname(python_exe))
+    site_packages = _get_penv_site_packages(penv_dir)
+    if not site_packages:
+        return None
+    uv_executable = get_executable_path(penv_dir, "uv")
+    parts = [json.dumps(deps, sort_keys=True), os.path.realpath(python_exe),
+             os.path.realpath(uv_executable)]
+    try:
+        parts.append(str(os.path.getmtime(python_exe)))
+        parts.append(str(os.path.getmtime(site_packages)))
+        parts.append(str(os.path.getmtime(uv_executable)))
+    except OSError:
+        return None
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _read_deps_stamps(stamp_file):
+    """Return the list of dependency fingerprints known to be satisfied."""
+    try:
+        with open(stamp_file, "r", encoding="utf-8") as fp:
+            stamps = json.load(fp)
+        return stamps if isinstance(stamps, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def _write_deps_stamp(stamp_file, python_exe, deps):
+    """Record the current dependency fingerprint as satisfied."""
+    stamp_key = _get_deps_stamp_key(python_exe, deps)
+    if not stamp_key:
+        return
+    # Core and additional (e.g. pio-lock) dependency sets are checked
+    # separately, keep a few recent fingerprints so they don't evict each other
+    stamps = [key for key in _read_deps_stamps(stamp_file) if key != stamp_key]
+    stamps = (stamps + [stamp_key])[-DEPS_STAMP_MAX_ENTRIES:]
+    try:
+        with open(stamp_file, "w", encoding="utf-8") as fp:
+            json.dump(stamps, fp)
+    except OSError:
+        pass
+
+
 def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, additional_deps=None):
     """
     Ensure uv package manager is available in penv and install required Python dependencies.
@@ -370,6 +483,17 @@ def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, a
     penv_dir = os.path.dirname(os.path.dirname(python_exe))
     penv_uv_executable = get_executable_path(penv_dir, "uv")
 
+    # Combine core and additional dependencies
+    all_deps = dict(python_deps)
+    if additional_deps:
+        all_deps.update(additional_deps)
+
+    # Nothing changed since the last successful check, skip all uv calls
+    stamp_file = str(Path(penv_dir) / DEPS_STAMP_FILE)
+    stamp_key = _get_deps_stamp_key(python_exe, all_deps)
+    if stamp_key and stamp_key in _read_deps_stamps(stamp_file):
+        return True
+
     # Build subprocess environment with UV_CACHE_DIR if specified
     uv_env = None
     if uv_cache_dir:
@@ -417,7 +541,8 @@ def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, a
                 pass
             try:
                 subprocess.check_call(
-                    [python_exe, "-m", "pip", "install", "uv>=0.1.0", "--quiet", "--no-cache-dir"],
+                    [python_exe, "-m", "pip", "install", "uv>=0.1.0", "--quiet", "--no-cache-dir",
+                     "--disable-pip-version-check", "--no-input", "--no-compile"],
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.STDOUT,
                     timeout=300
@@ -458,9 +583,10 @@ def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, a
             if result_obj.returncode == 0:
                 content = result_obj.stdout.strip()
                 if content:
-                    packages = json.loads(content)
-                    for p in packages:
-                        result[p["name"].lower()] = pepver_to_semver(p["version"])
+                    result = {
+                        canonicalize_package_name(p["name"]): pepver_to_semver(p["version"])
+                        for p in json_loads(content)
+                    }
             else:
                 print(f"Warning: uv pip list failed with exit code {result_obj.returncode}")
                 if result_obj.stderr:
@@ -477,12 +603,9 @@ def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, a
 
         return result
 
-    installed_packages = _get_installed_uv_packages()
-
-    # Combine core and additional dependencies
-    all_deps = dict(python_deps)
-    if additional_deps:
-        all_deps.update(additional_deps)
+    installed_packages = get_installed_packages(penv_dir, all_deps)
+    if installed_packages is None:
+        installed_packages = _get_installed_uv_packages()
 
     packages_to_install = list(get_packages_to_install(all_deps, installed_packages))
 
@@ -523,6 +646,7 @@ def install_python_deps(python_exe, external_uv_executable, uv_cache_dir=None, a
             print(f"Error installing Python dependencies: {e}")
             return False
 
+    _write_deps_stamp(stamp_file, python_exe, all_deps)
     return True
 
 
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import json
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BOARD_SCRIPT = Path(__file__).resolve().parent.parent / "boards" / "m5stack-tab5-p4.py"
+M5UNIFIED = "https://github.com/M5Stack/M5Unified.git"
+
+
+def _load_board_script():
+    """Load the board hook the same way builder/main.py does, as a fresh module."""
+    spec = importlib.util.spec_from_file_location("m5stack_tab5_p4", BOARD_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeEnv:
+
+    def __init__(self, project_dir, frameworks=("arduino",)):
+        self.project_dir = str(project_dir)
+        self.frameworks = list(frameworks)
+
+    def get(self, key, default=None):
+        return self.frameworks if key == "PIOFRAMEWORK" else default
+
+    def subst(self, value):
+        return {"$PROJECT_DIR": self.project_dir, "$PIOENV": "tab5"}[value]
+
+
+class FakeLibraryPackageManager:
+    """Stand-in for PlatformIO's manager, creates the folder with a .piopm."""
+
+    instances = []
+    fail_with = None
+
+    def __init__(self, package_dir):
+        self.package_dir = Path(package_dir)
+        self.installed = []
+        FakeLibraryPackageManager.instances.append(self)
+
+    def install(self, spec):
+        if FakeLibraryPackageManager.fail_with is not None:
+            raise FakeLibraryPackageManager.fail_with
+        self.installed.append(spec)
+        lib_path = self.package_dir / "M5Unified"
+        lib_path.mkdir(parents=True, exist_ok=True)
+        (lib_path / ".piopm").write_text("{}")
+        return types.SimpleNamespace(metadata=types.SimpleNamespace(version="0.2.8"))
+
+
+class TestM5StackTab5Deps(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.lib_dir = self.temp_dir / ".pio" / "libdeps" / "tab5"
+        self.board = _load_board_script()
+        FakeLibraryPackageManager.instances = []
+        FakeLibraryPackageManager.fail_with = None
+        fake_module = types.ModuleType("platformio.package.manager.library")
+        fake_module.LibraryPackageManager = FakeLibraryPackageManager
+        patcher = mock.patch.dict(
+            sys.modules, {"platformio.package.manager.library": fake_module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _configure(self):
+        self.board.configure_board(FakeEnv(self.temp_dir))
+
+    def _installs(self):
+        return [spec for lm in FakeLibraryPackageManager.instances for spec in lm.installed]
+
+    def _write_manifest(self):
+        self.lib_dir.mkdir(parents=True, exist_ok=True)
+        (self.lib_dir / ".m5deps.json").write_text(json.dumps({M5UNIFIED: "0.2.8"}))
+
+    def test_cold_run_installs_and_writes_manifest(self):
+        self._configure()
+
+        self.assertEqual(self._installs(), [M5UNIFIED])
+        manifest = json.loads((self.lib_dir / ".m5deps.json").read_text())
+        self.assertEqual(manifest, {M5UNIFIED: "0.2.8"})
+
+    def test_warm_run_skips_library_manager(self):
+        self._configure()
+        FakeLibraryPackageManager.instances = []
+
+        self._configure()
+
+        self.assertEqual(FakeLibraryPackageManager.instances, [])
+
+    def test_library_without_piopm_is_reinstalled(self):
+        self._write_manifest()
+        (self.lib_dir / "M5Unified").mkdir()
+
+        self._configure()
+
+        self.assertEqual(self._installs(), [M5UNIFIED])
+        self.assertTrue((self.lib_dir / "M5Unified" / ".piopm").is_file())
+
+    def test_installed_library_without_manifest_is_not_reinstalled(self):
+        (self.lib_dir / "M5Unified").mkdir(parents=True)
+        (self.lib_dir / "M5Unified" / ".piopm").write_text("{}")
+
+        self._configure()
+
+        self.assertEqual(self._installs(), [])
+        manifest = json.loads((self.lib_dir / ".m5deps.json").read_text())
+        self.assertEqual(manifest, {M5UNIFIED: None})
+
+    def test_install_failure_propagates_without_manifest(self):
+        FakeLibraryPackageManager.fail_with = RuntimeError("clone failed")
+
+        with self.assertRaises(RuntimeError):
+            self._configure()
+
+        self.assertFalse((self.lib_dir / ".m5deps.json").exists())
+
+    def test_non_arduino_framework_is_ignored(self):
+        self.board.configure_board(FakeEnv(self.temp_dir, frameworks=("espidf",)))
+
+        self.assertEqual(FakeLibraryPackageManager.instances, [])
+        self.assertFalse(self.lib_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
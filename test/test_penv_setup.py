@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import ast
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import unittest
+from importlib.metadata import distributions
+from pathlib import Path
+
+PENV_HELPERS = (
+    "get_executable_path",
+    "_get_penv_site_packages",
+    "canonicalize_package_name",
+    "get_installed_packages",
+    "_get_deps_stamp_key",
+    "_read_deps_stamps",
+    "_write_deps_stamp",
+)
+PENV_CONSTANTS = ("DEPS_STAMP_FILE", "DEPS_STAMP_MAX_ENTRIES")
+IS_WINDOWS = os.name == "nt"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_penv_helpers():
+    """Load the helpers without importing penv_setup.py's PlatformIO dependencies."""
+    penv_path = Path(__file__).resolve().parent.parent / "builder" / "penv_setup.py"
+    module_ast = ast.parse(penv_path.read_text(encoding="utf8"), filename=str(penv_path))
+    body = [
+        node
+        for node in module_ast.body
+        if (isinstance(node, ast.FunctionDef) and node.name in PENV_HELPERS)
+        or (isinstance(node, ast.Assign)
+            and any(getattr(target, "id", None) in PENV_CONSTANTS for target in node.targets))
+    ]
+    found = {getattr(node, "name", None) for node in body}
+    missing = set(PENV_HELPERS) - found
+    if missing:
+        raise AssertionError(f"{sorted(missing)} not found in builder/penv_setup.py")
+    isolated_module = ast.Module(body=body, type_ignores=[])
+    # Keep this namespace synchronized with the helpers' module-level
+    # dependencies. pepver_to_semver comes from PlatformIO and is replaced by
+    # the identity, which is enough for the plain versions used below.
+    namespace = {
+        "os": os,
+        "re": re,
+        "json": json,
+        "hashlib": hashlib,
+        "Path": Path,
+        "IS_WINDOWS": IS_WINDOWS,
+        "distributions": distributions,
+        "pepver_to_semver": lambda version: version,
+    }
+    exec(compile(isolated_module, filename=str(penv_path), mode="exec"), namespace)
+    return namespace
+
+
+penv = _load_penv_helpers()
+
+
+class PenvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.penv_dir = self.temp_dir / "penv"
+        if IS_WINDOWS:
+            self.site_packages = self.penv_dir / "Lib" / "site-packages"
+        else:
+            self.site_packages = self.penv_dir / "lib" / "python3.11" / "site-packages"
+        self.site_packages.mkdir(parents=True)
+        self.python_exe = Path(penv["get_executable_path"](str(self.penv_dir), "python"))
+        self.uv_exe = Path(penv["get_executable_path"](str(self.penv_dir), "uv"))
+        self.python_exe.parent.mkdir(parents=True)
+        self.python_exe.write_text("")
+        self.uv_exe.write_text("")
+        self.stamp_file = str(self.penv_dir / penv["DEPS_STAMP_FILE"])
+        self.deps = {"pyyaml": ">=6.0.2", "rich-click": ">=1.8.6"}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _add_distribution(self, name, version):
+        dist_info = self.site_packages / f"{name}-{version}.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+
+    def _touch(self, path):
+        later = time.time() + 10
+        os.utime(path, (later, later))
+
+
+class TestDepsStamp(PenvTestCase):
+
+    def test_written_stamp_is_read_back(self):
+        penv["_write_deps_stamp"](self.stamp_file, str(self.python_exe), self.deps)
+
+        key = penv["_get_deps_stamp_key"](str(self.python_exe), self.deps)
+        self.assertIsNotNone(key)
+        self.assertEqual(penv["_read_deps_stamps"](self.stamp_file), [key])
+
+    def test_key_depends_on_deps(self):
+        key = penv["_get_deps_stamp_key"](str(self.python_exe), self.deps)
+        other = penv["_get_deps_stamp_key"](
+            str(self.python_exe), {**self.deps, "rich": ">=14.0.0"})
+
+        self.assertNotEqual(key, other)
+
+    def test_key_changes_when_site_packages_change(self):
+        key = penv["_get_deps_stamp_key"](str(self.python_exe), self.deps)
+        self._touch(self.site_packages)
+
+        self.assertNotEqual(key, penv["_get_deps_stamp_key"](str(self.python_exe), self.deps))
+
+    def test_key_changes_when_uv_is_replaced(self):
+        key = penv["_get_deps_stamp_key"](str(self.python_exe), self.deps)
+        self._touch(self.uv_exe)
+
+        self.assertNotEqual(key, penv["_get_deps_stamp_key"](str(self.python_exe), self.deps))
+
+    def test_no_key_without_uv(self):
+        self.uv_exe.unlink()
+
+        self.assertIsNone(penv["_get_deps_stamp_key"](str(self.python_exe), self.deps))
+
+    def test_no_key_without_site_packages(self):
+        shutil.rmtree(self.site_packages)
+
+        self.assertIsNone(penv["_get_deps_stamp_key"](str(self.python_exe), self.deps))
+
+    def test_rewriting_a_stamp_does_not_duplicate_it(self):
+        for _ in range(3):
+            penv["_write_deps_stamp"](self.stamp_file, str(self.python_exe), self.deps)
+
+        self.assertEqual(len(penv["_read_deps_stamps"](self.stamp_file)), 1)
+
+    def test_oldest_stamps_are_evicted(self):
+        max_entries = penv["DEPS_STAMP_MAX_ENTRIES"]
+        keys = []
+        for index in range(max_entries + 2):
+            deps = {**self.deps, f"extra-{index}": ">=1.0.0"}
+            penv["_write_deps_stamp"](self.stamp_file, str(self.python_exe), deps)
+            keys.append(penv["_get_deps_stamp_key"](str(self.python_exe), deps))
+
+        self.assertEqual(penv["_read_deps_stamps"](self.stamp_file), keys[-max_entries:])
+
+    def test_unreadable_stamp_file_counts_as_empty(self):
+        Path(self.stamp_file).write_text("not json")
+        self.assertEqual(penv["_read_deps_stamps"](self.stamp_file), [])
+
+        Path(self.stamp_file).write_text(json.dumps({"key": "value"}))
+        self.assertEqual(penv["_read_deps_stamps"](self.stamp_file), [])
+
+
+class TestGetInstalledPackages(PenvTestCase):
+
+    def test_returns_canonical_names_of_installed_packages(self):
+        self._add_distribution("PyYAML", "6.0.2")
+        self._add_distribution("rich_click", "1.8.9")
+
+        installed = penv["get_installed_packages"](
+            str(self.penv_dir), ["pyyaml", "rich-click", "intelhex"])
+
+        self.assertEqual(installed, {"pyyaml": "6.0.2", "rich-click": "1.8.9"})
+
+    def test_returns_none_without_site_packages(self):
+        shutil.rmtree(self.site_packages)
+
+        self.assertIsNone(penv["get_installed_packages"](str(self.penv_dir), ["pyyaml"]))
+
+
+if __name__ == "__main__":
+    unittest.main()